@@ -20,25 +20,64 @@
 import numpy as np
 import state_manager as sm
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional: without it the decorated kernels run as plain Python.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+try:
+    # SciPy's pocketfft is multi-threaded (and MKL-aware) unlike numpy.fft
+    import scipy.fft as _fft
+    _FFT_KW = {'workers': -1}
+except ImportError:
+    _fft = np.fft
+    _FFT_KW = {}
+
+try:
+    # pyFFTW is optional: when present, impulse FFTs run through reusable plans
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+# ------------------------------------------------------------
+# Cache Helpers
+# ------------------------------------------------------------
+
+def cache_put(cache, key, value, max_size):
+    """
+    Stores value in the bounded dict cache, evicting the oldest entry
+    once max_size is reached. Returns value.
+    """
+    if len(cache) >= max_size:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+    return value
+
 # ------------------------------------------------------------
 # Basic Signal Generators
 # ------------------------------------------------------------
 
 def unit_step(t):
     """Generates a unit step signal: u[n] = 1 for n >= 0."""
-    return np.where(t >= 0, 1.0, 0.0)
+    return np.asarray(t >= 0, dtype=np.float64)
 
 def impulse(t):
     """Generates a unit impulse: delta[n] = 1 for n == 0."""
-    return np.where(np.abs(t) < 1e-9, 1.0, 0.0)
+    return np.asarray(np.abs(t) < 1e-9, dtype=np.float64)
 
 def ramp(t):
     """Generates a ramp signal: r[n] = n * u[n]."""
-    return t * unit_step(t)
+    return np.maximum(t, 0.0)
 
 def rect(t, width):
     """Generates a rectangular pulse of specified width."""
-    return np.where((t >= 0) & (t < width), 1.0, 0.0)
+    return np.asarray((t >= 0) & (t < width), dtype=np.float64)
 
 def pulse_train_gen(n_array, start, space, num):
     """
@@ -63,90 +102,305 @@ def pulse_train_gen(n_array, start, space, num):
 # Digital Filtering Core
 # ------------------------------------------------------------
 
-def filter_signal(b, a, x):
+@njit(cache=True, fastmath=True)
+def _iir_feedback(y, a):
+    """
+    Applies the feedback (a coefficients) recurrence to y in place.
+    y must already hold the feedforward output.
+    """
+    N = len(a)
+    for n in range(len(y)):
+        for m in range(1, min(n, N - 1) + 1):
+            y[n] -= a[m] * y[n - m]
+    return y
+
+# Compile the real-valued kernel once at import instead of on first Simulate
+_iir_feedback(np.zeros(2), np.array([1.0, 0.0]))
+
+def filter_signal(b, a, x, delay=0):
     """
     Implements a Direct Form II structure to filter signal x
     using numerator coeffs b and denominator coeffs a.
+    a must be monic (a[0] == 1), as returned by coeffs_quantized.
+    delay applies the System Delay z^-delay (zero-filled, not circular).
     """
-    # Normalize by a[0] if necessary
-    if a[0] != 1.0 and a[0] != 0:
-        b = b / a[0]
-        a = a / a[0]
-        
-    y = np.zeros_like(x)
-    M, N = len(b), len(a)
-    
-    # Standard Difference Equation Implementation
-    for n in range(len(x)):
-        # Feedforward part (b coefficients)
-        for k in range(M):
-            if n - k >= 0: y[n] += b[k] * x[n - k]
-            
-        # Feedback part (a coefficients)
-        for m in range(1, N):
-            if n - m >= 0: y[n] -= a[m] * y[n - m]
-            
+    N = len(x)
+    y = np.zeros(N, dtype=np.result_type(x, b, a))
+    if abs(delay) >= N:
+        return y
+
+    # The filter is causal, so with a delay > 0 only the first N - delay
+    # inputs reach the output; filter them straight into the shifted slot.
+    # With a delay < 0 the first -delay outputs are dropped instead.
+    if delay >= 0:
+        x = x[:N - delay]
+    seg = y[delay:] if delay >= 0 else np.empty(N, dtype=y.dtype)
+
+    # Feedforward part (b coefficients): a single causal convolution
+    seg[:] = np.convolve(x, b)[:len(x)]
+
+    # Feedback part (a coefficients): serial recurrence on past outputs
+    _iir_feedback(seg, a)
+
+    if delay < 0:
+        y[:N + delay] = seg[-delay:]
     return y
 
 # ------------------------------------------------------------
 # Z-Transform & Response Analysis
 # ------------------------------------------------------------
 
+# Recent compute_H results, keyed on the filter state and frequency grid
+_H_cache = {}
+_H_CACHE_SIZE = 8
+
+# Unit-circle points z = e^jw for recently used frequency grids
+_z_cache = {}
+_Z_CACHE_SIZE = 4
+
+# Recent (mag_db, phase) curves, keyed on the filter state and frequency grid
+_curve_cache = {}
+_CURVE_CACHE_SIZE = 8
+
+# Recent coeffs_quantized results, keyed on the roots and gain
+_coeff_cache = {}
+_COEFF_CACHE_SIZE = 8
+
 def compute_H(w_vals):
     """
     Computes the complex Frequency Response H(e^jw) for the current 
     poles and zeros in the global state.
+    Results are memoized, so the returned array is read-only.
     """
-    z = np.exp(1j * w_vals)
-    H = np.ones_like(z, dtype=complex)
-    
-    # Apply System Gain
-    H *= sm.system_gain
-    
-    # Apply System Delay (z^k or z^-k)
-    if sm.system_delay != 0:
-        H *= (z **-sm.system_delay)
+    w_key = w_vals.tobytes()
+    key = (tuple(sm.zeros), tuple(sm.poles), sm.system_gain, sm.system_delay,
+           w_key)
+    H = _H_cache.get(key)
+    if H is None:
+        H = _evaluate_H(_unit_circle(w_vals, w_key))
+        H.flags.writeable = False
+        cache_put(_H_cache, key, H, _H_CACHE_SIZE)
+    return H
+
+def _unit_circle(w_vals, w_key):
+    """
+    Returns z = e^jw for the grid w_vals, reusing the array computed for
+    the same grid (identified by w_key, its raw bytes) on earlier calls.
+    """
+    z = _z_cache.get(w_key)
+    if z is None:
+        z = np.exp(1j * w_vals)
+        z.flags.writeable = False
+        cache_put(_z_cache, w_key, z, _Z_CACHE_SIZE)
+    return z
+
+def _horner(c, z):
+    """
+    Evaluates the polynomial with coefficients c (highest power first) at z.
+    Each step is an in-place multiply-add on one buffer, unlike np.polyval
+    which allocates two temporaries per coefficient.
+    """
+    y = np.full(z.shape, c[0], dtype=np.complex128)
+    for ck in c[1:]:
+        y *= z
+        y += ck
+    return y
 
-    # Accumulate Zeros: (1 - z0 * z^-1) -> H *= (1 - z0/z)
-    for z0 in sm.zeros:
-        H *= (1 - z0 / z)
+@njit(cache=True, fastmath=True, parallel=True)
+def _eval_H_numba(b, a, z):
+    """
+    Evaluates num(z)/den(z) point by point with Horner's method, keeping
+    both accumulators in registers. Mirrors the singularity guard below.
+    """
+    out = np.empty(len(z), dtype=np.complex128)
+    for i in prange(len(z)):
+        zi = z[i]
+        num = b[0]
+        for k in range(1, len(b)):
+            num = num * zi + b[k]
+        den = a[0]
+        for k in range(1, len(a)):
+            den = den * zi + a[k]
+        if abs(den) < 1e-10:
+            den = 1e-10
+        out[i] = num / den
+    return out
+
+if prange is not range:
+    # Compile the kernel at import instead of on the first redraw
+    _eval_H_numba(np.ones(1, np.complex128), np.ones(1, np.complex128),
+                  np.ones(1, np.complex128))
+
+def _evaluate_H(z):
+    """Evaluates H at the unit-circle points z without consulting the cache."""
+    # Polynomial form of the roots, evaluated with Horner's method
+    b = np.poly(sm.zeros) if len(sm.zeros) else np.array([1.0])
+    a = np.poly(sm.poles) if len(sm.poles) else np.array([1.0])
+
+    if prange is not range:
+        # Numba: one fused parallel pass over z
+        H = _eval_H_numba(b.astype(np.complex128), a.astype(np.complex128), z)
+    else:
+        num = _horner(b, z)
+        den = _horner(a, z)
 
-    # Accumulate Poles: 1 / (1 - p0 * z^-1)
-    for p0 in sm.poles:
-        denom = (1 - p0 / z)
         # Avoid division by zero singularities
-        denom[abs(denom) < 1e-10] = 1e-10 
-        H /= denom
+        den[np.abs(den) < 1e-10] = 1e-10
+
+        # Combine in place to avoid full-length temporaries
+        H = num
+        H /= den
+
+    # Apply System Gain
+    H *= sm.system_gain
+
+    # Each factor (1 - r*z^-1) is (z - r)/z, so the root form carries an extra
+    # z^(P-K) on top of the System Delay (z^k or z^-k). Apply both at once.
+    k = len(sm.poles) - len(sm.zeros) - sm.system_delay
+    if k != 0:
+        H *= z ** k
 
     return H
 
+def is_real_system(tol=1e-9):
+    """
+    Returns True when every complex pole and zero has its conjugate in
+    the state, i.e. the filter coefficients (and h[n]) are real.
+    """
+    for roots in (sm.zeros, sm.poles):
+        if len(roots) and np.any(np.abs(np.imag(np.poly(roots))) > tol):
+            return False
+    return True
+
+def response_curves(w_vals, split):
+    """
+    Returns the normalized magnitude in dB and the phase of H over the
+    grid w_vals (symmetric about 0, first w >= 0 at index split).
+    Results are memoized, so the returned arrays are read-only.
+    """
+    key = (tuple(sm.zeros), tuple(sm.poles), sm.system_gain, sm.system_delay,
+           w_vals.tobytes())
+    cached = _curve_cache.get(key)
+    if cached is None:
+        if is_real_system():
+            # Real coefficients: H(-w) = conj(H(w)), so evaluate w >= 0 only
+            # and mirror it onto the negative half of the symmetric grid
+            H_pos = compute_H(w_vals[split:])
+            H = np.concatenate([np.conj(H_pos[::-1][:split]), H_pos])
+        else:
+            H = compute_H(w_vals)
+        # |H| -> normalized -> dB in a single buffer (one allocation, no
+        # temporaries); it is cached below, so it can't be a shared scratch
+        mag_db = np.abs(H)
+
+        max_val = np.max(mag_db)
+        if max_val > 1e-9:
+            mag_db /= max_val
+
+        mag_db += 1e-12
+        np.log10(mag_db, out=mag_db)
+        mag_db *= 20
+        phase = np.angle(H)
+        mag_db.flags.writeable = False
+        phase.flags.writeable = False
+
+        cached = cache_put(_curve_cache, key, (mag_db, phase), _CURVE_CACHE_SIZE)
+    return cached
+
 def coeffs_quantized():
     """
     Converts roots (poles/zeros) to polynomial coefficients (b, a)
     and quantizes them to 3 decimal places for display.
+    Results are memoized on the roots and gain; callers get copies.
     """
-    b = np.poly(sm.zeros) if sm.zeros else np.array([1.0])
-    a = np.poly(sm.poles) if sm.poles else np.array([1.0])
-    
-    # Scale numerator by system gain
-    b = b * sm.system_gain
-    
-    return np.round(b, 3), np.round(a, 3) 
+    key = (tuple(sm.zeros), tuple(sm.poles), sm.system_gain)
+    cached = _coeff_cache.get(key)
+    if cached is None:
+        b = np.poly(sm.zeros) if len(sm.zeros) else np.array([1.0])
+        a = np.poly(sm.poles) if len(sm.poles) else np.array([1.0])
+        
+        # Scale numerator by system gain
+        b = b * sm.system_gain
+        
+        cached = cache_put(_coeff_cache, key, (np.round(b, 3), np.round(a, 3)),
+                           _COEFF_CACHE_SIZE)
+
+    b, a = cached
+    return b.copy(), a.copy()
 
-def stable_impulse_response():
+# Frequency grids and pyFFTW plans for the impulse FFT, keyed by (N, real)
+_fft_grids = {}
+_fft_plans = {}
+
+def _fft_grid(N, real):
+    """
+    Returns the DFT frequencies 2*pi*k/N (only k <= N/2 when real),
+    built once per FFT size.
+    """
+    key = (N, real)
+    w = _fft_grids.get(key)
+    if w is None:
+        k = np.arange(N // 2 + 1 if real else N)
+        w = 2 * np.pi * k / N
+        w.flags.writeable = False
+        _fft_grids[key] = w
+    return w
+
+def _inverse_fft(H, N, real):
+    """
+    Inverse FFT of the sampled response H, returning real h[n].
+    real selects irfft on a half-spectrum instead of a full complex ifft.
+    With pyFFTW, one aligned FFTW plan per (N, real) is built lazily and
+    reused on later calls; otherwise scipy.fft / numpy.fft is used.
+    """
+    if pyfftw is None:
+        if real:
+            return _fft.irfft(H, n=N, **_FFT_KW)
+        return np.real(_fft.ifft(H, **_FFT_KW))
+
+    key = (N, real)
+    plan = _fft_plans.get(key)
+    if plan is None:
+        buf = pyfftw.empty_aligned(len(H), dtype='complex128')
+        builder = pyfftw.builders.irfft if real else pyfftw.builders.ifft
+        plan = builder(buf, n=N, planner_effort='FFTW_MEASURE')
+        _fft_plans[key] = plan
+
+    # The plan copies H into its input buffer and reuses its output buffer
+    out = plan(H)
+    return out.copy() if real else out.real.copy()
+
+def stable_impulse_response(centered=True):
     """
     Computes the impulse response using the Inverse FFT of the 
     frequency response. This method is stable even for unstable filters
     because it evaluates on the unit circle.
+    With centered=False the raw FFT ordering n = 0..N-1 is returned,
+    skipping the shift to n = -N/2..N/2-1.
     """
-    # Recalculate frequency grid based on current N_impulse
-    k = np.arange(sm.N_impulse)
-    w_fft = 2 * np.pi * k / sm.N_impulse 
-    
-    H_fft = compute_H(w_fft)
-    
-    h = np.fft.ifft(H_fft)
-    h_shifted = np.fft.fftshift(h)
+    N = sm.N_impulse
+
+    if len(sm.poles) == 0:
+        # FIR: h[n] is the numerator itself, shifted by the System Delay and
+        # wrapped modulo N exactly as the sampled spectrum would alias it
+        b = np.poly(sm.zeros) if len(sm.zeros) else np.array([1.0])
+        h = np.zeros(N)
+        np.add.at(h, (np.arange(len(b)) + sm.system_delay) % N,
+                  sm.system_gain * np.real(b))
+    elif is_real_system():
+        # Real h[n]: H is conjugate-symmetric, so only the half-spectrum
+        # 0 <= w <= pi is needed and irfft returns a real sequence
+        H_half = compute_H(_fft_grid(N, True))
+        h = _inverse_fft(H_half, N, True)
+    else:
+        H_fft = compute_H(_fft_grid(N, False))
+        h = _inverse_fft(H_fft, N, False)
+
+    if not centered:
+        return np.arange(N), h
+
+    # Swap the two halves (fftshift for even N) with a single copy
+    h_shifted = np.concatenate([h[N//2:], h[:N//2]])
     
-    n = np.arange(-sm.N_impulse//2, sm.N_impulse//2)
-    return n, np.real(h_shifted)
\ No newline at end of file
+    n = np.arange(-N//2, N//2)
+    return n, h_shifted
\ No newline at end of file
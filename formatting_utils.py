@@ -18,11 +18,21 @@
 # =============================================================================
 
 import re
+import numpy as np
 
 # ------------------------------------------------------------
 # Text & LaTeX Formatting
 # ------------------------------------------------------------
 
+# Patterns used by format_latex_title, compiled once at import
+_PI_RE = re.compile(r'\bpi\b')
+_FUNC_RES = [(re.compile(rf'\b{func}\b'), rf'\\{func}')
+             for func in ('sin', 'cos', 'tan', 'exp', 'log', 'sinc', 'sqrt')]
+_DELTA_RE = re.compile(r'\b(d|delta|impulse)\(')
+
+# Digits and minus sign mapped to their unicode superscript forms
+_SUPERSCRIPT = str.maketrans('0123456789-', '⁰¹²³⁴⁵⁶⁷⁸⁹⁻')
+
 def fmt_coeff(c):
     """
     Formats a complex number into a clean string representation.
@@ -32,21 +42,36 @@ def fmt_coeff(c):
     op = "+" if c.imag >= 0 else "-"
     return f"({c.real:.2f} {op} {abs(c.imag):.2f}j)"
 
+def _join_poly_terms(c, z_power):
+    """
+    Joins the non-zero terms of polynomial c, rendering z^-k with z_power(k).
+    """
+    # Real coefficients (the usual np.poly output) skip fmt_coeff's
+    # imaginary-part check and format directly
+    fmt_term = (lambda v: f"{v:.2f}") if np.isrealobj(c) else fmt_coeff
+    terms = " + ".join(
+        fmt_term(v) if k == 0 else fmt_term(v) + z_power(k)
+        for k, v in enumerate(c) if abs(v) >= 1e-12
+    )
+    return terms or "0"
+
 def poly_to_mathtext(c):
     """
     Converts a list of polynomial coefficients into a LaTeX-formatted 
     z-transform string.
     """
-    terms = []
-    for k, v in enumerate(c):
-        if abs(v) < 1e-12:
-            continue
-        coeff = fmt_coeff(v)
-        if k == 0:
-            terms.append(coeff)
-        else:
-            terms.append(rf"{coeff}z^{{-{k}}}")
-    return " + ".join(terms) if terms else "0"
+    return _join_poly_terms(c, lambda k: rf"z^{{-{k}}}")
+
+def superscript(k):
+    """Renders an integer as unicode superscript characters (e.g. -2 -> ⁻²)."""
+    return str(k).translate(_SUPERSCRIPT)
+
+def poly_to_plaintext(c):
+    """
+    Converts a list of polynomial coefficients into a plain-text 
+    z-transform string using unicode superscripts (no mathtext parsing).
+    """
+    return _join_poly_terms(c, lambda k: "z" + superscript(-k))
 
 def format_latex_title(expr):
     """
@@ -59,19 +84,18 @@ def format_latex_title(expr):
     
     # 2. Replace 'pi' -> '\pi' (Use regex to match whole word 'pi' only)
     # This prevents replacing the 'pi' inside 'exp' or '\pi' itself
-    tex = re.sub(r'\bpi\b', r'\\pi', tex)
+    tex = _PI_RE.sub(r'\\pi', tex)
 
     # 3. Replace functions (sin, cos, etc.)
     # We use \b to ensure we match 'sin' but not 'sinc' or '\sin'
-    funcs = ['sin', 'cos', 'tan', 'exp', 'log', 'sinc', 'sqrt']
-    for func in funcs:
+    for func_re, repl in _FUNC_RES:
         # Replace 'func' with '\func'
-        tex = re.sub(rf'\b{func}\b', rf'\\{func}', tex)
+        tex = func_re.sub(repl, tex)
 
     # 4. Special cases for u(n) and delta(n)
     # Replace 'u(' with 'u(' (no change needed usually, or \text{u})
     # Replace 'd(' or 'delta(' or 'impulse(' with '\delta('
-    tex = re.sub(r'\b(d|delta|impulse)\(', r'\\delta(', tex)
+    tex = _DELTA_RE.sub(r'\\delta(', tex)
     
     # Correction for double backslash if any crept in
     tex = tex.replace(r'\\\sin', r'\sin') 
@@ -82,23 +106,22 @@ def format_latex_title(expr):
 # Input Parsing
 # ------------------------------------------------------------
 
+# Brackets and whitespace are stripped from the whole input in one pass
+_CLEAN_RE = re.compile(r'[()\s]')
+
 def parse_complex_list(text):
     """
     Parses a comma-separated string of complex numbers.
     """
-    if not text.strip(): return []
+    text = _CLEAN_RE.sub('', text)
+    if not text: return []
     
-    parts = text.split(',')
     clean_nums = []
-    for p in parts:
-        p = p.strip().replace('(', '').replace(')', '').replace(' ', '')
+    for p in text.split(','):
         if not p: continue
         try:
             clean_nums.append(complex(p))
         except ValueError:
-            try:
-                clean_nums.append(complex(float(p)))
-            except ValueError:
-                pass
+            pass
                 
     return clean_nums
\ No newline at end of file
@@ -17,32 +17,80 @@
 # See <https://www.gnu.org/licenses/>.
 # =============================================================================
 
+import time
 import tkinter as tk
 from tkinter import simpledialog, Menu
 import numpy as np
+from matplotlib.backend_bases import TimerBase
 import state_manager as sm
 import dsp_engine as dsp
 
 # ------------------------------------------------------------
 # Module Globals (Injected by Main)
 # ------------------------------------------------------------
-_tk_root = None
+_get_tk_root = None # Callable returning the (lazily created) Tk root
 _update_callback = None
+_drag_callback = None
 
-def init_interactions(root, callback):
+# Drag redraws are throttled to ~60 Hz; a full update follows on release
+_DRAG_INTERVAL = 1 / 60
+_last_drag_update = 0.0
+_drag_moved = False
+# Single-shot canvas timer drawing the last throttled-away drag position
+_drag_timer = None
+_drag_pending = False
+
+def init_interactions(get_root, callback, drag_callback=None):
     """
-    Initializes the interaction module with the main Tkinter root 
-    and the update_all callback function from main.py.
+    Initializes the interaction module with a callable returning the
+    Tkinter root (only called when a menu or dialog opens), the
+    update_all callback function from main.py and, optionally,
+    a lighter update_fast callback used while dragging.
     """
-    global _tk_root, _update_callback
-    _tk_root = root
+    global _get_tk_root, _update_callback, _drag_callback
+    _get_tk_root = get_root
     _update_callback = callback
+    _drag_callback = drag_callback
 
 def trigger_update():
     """Safe wrapper to call the main update loop."""
     if _update_callback:
         _update_callback()
 
+def trigger_drag_update():
+    """Calls the drag-time update, falling back to the main update loop."""
+    if _drag_callback:
+        _drag_callback()
+    else:
+        trigger_update()
+
+def _flush_drag_update():
+    """Trailing drag redraw: draws the position of the last skipped event."""
+    global _drag_pending, _last_drag_update
+    if not _drag_pending or sm.dragging is None:
+        return
+    _drag_pending = False
+    _last_drag_update = time.perf_counter()
+    trigger_drag_update()
+
+def _schedule_drag_update():
+    """
+    Arms the trailing redraw for a throttled motion event, so the point
+    doesn't stay one event behind when the mouse stops.
+    """
+    global _drag_timer, _drag_pending
+    if _drag_pending:
+        return
+    if _drag_timer is None:
+        _drag_timer = sm.fig.canvas.new_timer(interval=round(_DRAG_INTERVAL * 1000))
+        _drag_timer.single_shot = True
+        _drag_timer.add_callback(_flush_drag_update)
+    # A bare TimerBase (non-interactive canvas) never fires
+    if type(_drag_timer) is TimerBase:
+        return
+    _drag_pending = True
+    _drag_timer.start()
+
 # ------------------------------------------------------------
 # Mode Control
 # ------------------------------------------------------------
@@ -97,9 +145,10 @@ def on_press(event):
     z = event.xdata + 1j * event.ydata
     
     def find_closest(points, threshold=0.1):
-        for i, val in enumerate(points):
-            if abs(z - val) < threshold: return i
-        return None
+        if len(points) == 0: return None
+        dist = np.abs(np.asarray(points) - z)
+        i = int(dist.argmin())
+        return i if dist[i] < threshold else None
 
     z_idx = find_closest(sm.zeros)
     p_idx = find_closest(sm.poles)
@@ -125,23 +174,12 @@ def on_press(event):
     # Left Click -> Select/Drag or Add Point
     if event.button == 1:
         if sm.mode in ["zero", "pole"]:
-            if sm.mode == "zero":
-                sm.zeros.append(z)
-                sm.zeros_opts.append({'show': False, 'show_polar': False})
-                
-                if sm.add_conjugates and abs(z.imag) > 0.05: 
-                    sm.zeros.append(z.conjugate())
-                    sm.zeros_opts.append({'show': False, 'show_polar': False})
-                trigger_update()
-                
-            elif sm.mode == "pole":
-                sm.poles.append(z)
-                sm.poles_opts.append({'show': False, 'show_polar': False})
-                
-                if sm.add_conjugates and abs(z.imag) > 0.05: 
-                    sm.poles.append(z.conjugate())
-                    sm.poles_opts.append({'show': False, 'show_polar': False})
-                trigger_update()
+            new_pts = [z]
+            if sm.add_conjugates and abs(z.imag) > 0.05: 
+                new_pts.append(z.conjugate())
+
+            sm.add_points(sm.mode, new_pts)
+            trigger_update()
 
         elif target:
             sm.selected = target
@@ -191,18 +229,12 @@ def on_motion(event):
         # Update the dragged point first
         points[idx] = z_new
 
-        # Look for the conjugate pair
-        target_conj = z_old.conjugate()
-        
-        # Find index of the conjugate pair
-        pair_idx = None
-        min_dist = 0.2 # Threshold
-        
-        for i, p in enumerate(points):
-            if i == idx: continue # Don't match self
-            if abs(p - target_conj) < min_dist:
-                pair_idx = i
-                break
+        # Look for the conjugate pair (closest point within threshold)
+        dist = np.abs(points - z_old.conjugate())
+        dist[idx] = np.inf # Don't match self
+        pair_idx = int(dist.argmin())
+        if dist[pair_idx] >= 0.2: # Threshold
+            pair_idx = None
         
         # If a pair exists, update it to be the NEW conjugate
         if pair_idx is not None:
@@ -212,32 +244,47 @@ def on_motion(event):
         # Standard Drag (Single point)
         points[idx] = z_new
 
-    trigger_update()
+    # 4. Throttled drag-time redraw
+    global _last_drag_update, _drag_moved, _drag_pending
+    _drag_moved = True
+    now = time.perf_counter()
+    if now - _last_drag_update < _DRAG_INTERVAL:
+        _schedule_drag_update()
+        return
+    _last_drag_update = now
+    _drag_pending = False
+    trigger_drag_update()
 
 def on_release(event):
+    global _drag_moved, _drag_pending
+    dropped = sm.dragging is not None and _drag_moved
     sm.dragging = None
+    _drag_moved = False
+    _drag_pending = False
+    if dropped:
+        # Full redraw: impulse response, H(z) text and overlays were deferred
+        trigger_update()
 
 # ------------------------------------------------------------
 # Context Menu Logic
 # ------------------------------------------------------------
 
 def show_context_menu(event):
-    if not _tk_root: return
+    if not _get_tk_root: return
     
-    menu = Menu(_tk_root, tearoff=0)
+    menu = Menu(_get_tk_root(), tearoff=0)
     menu.add_command(label="Set Coordinate", command=set_coordinate)
     menu.add_command(label="Set Coordinate (Polar)", command=set_coordinate_polar)
     
     kind, idx = sm.selected
-    opts = sm.zeros_opts if kind == "zero" else sm.poles_opts
     
     # 1. Cartesian Toggle
-    coord_state = opts[idx]['show']
+    coord_state = (sm.zeros_show if kind == "zero" else sm.poles_show)[idx]
     coord_label = "Hide Rectangular (x,y)" if coord_state else "Show Rectangular (x,y)"
     menu.add_command(label=coord_label, command=toggle_coordinate)
 
     # 2. Polar Toggle
-    polar_state = opts[idx].get('show_polar', False)
+    polar_state = (sm.zeros_show_polar if kind == "zero" else sm.poles_show_polar)[idx]
     polar_label = "Hide Polar (r,θ)" if polar_state else "Show Polar (r,θ)"
     menu.add_command(label=polar_label, command=toggle_polar)
 
@@ -253,33 +300,30 @@ def show_context_menu(event):
 def toggle_coordinate():
     if sm.selected is None: return
     kind, idx = sm.selected
-    if kind == "zero":
-        sm.zeros_opts[idx]['show'] = not sm.zeros_opts[idx]['show']
-    else:
-        sm.poles_opts[idx]['show'] = not sm.poles_opts[idx]['show']
+    show = sm.zeros_show if kind == "zero" else sm.poles_show
+    show[idx] = not show[idx]
     trigger_update()
 
 def toggle_polar():
     if sm.selected is None: return
     kind, idx = sm.selected
-    if kind == "zero":
-        sm.zeros_opts[idx]['show_polar'] = not sm.zeros_opts[idx]['show_polar']
-    else:
-        sm.poles_opts[idx]['show_polar'] = not sm.poles_opts[idx]['show_polar']
+    show_polar = sm.zeros_show_polar if kind == "zero" else sm.poles_show_polar
+    show_polar[idx] = not show_polar[idx]
     trigger_update()
 
 def set_coordinate():
-    if sm.selected is None or not _tk_root: return
+    if sm.selected is None or not _get_tk_root: return
+    tk_root = _get_tk_root()
 
     kind, idx = sm.selected
     current_val = sm.zeros[idx] if kind == "zero" else sm.poles[idx]
 
     re = simpledialog.askfloat("Set Coordinate", "Real part:", 
-                               initialvalue=current_val.real, parent=_tk_root)
+                               initialvalue=current_val.real, parent=tk_root)
     if re is None: return
     
     im = simpledialog.askfloat("Set Coordinate", "Imaginary part:", 
-                               initialvalue=current_val.imag, parent=_tk_root)
+                               initialvalue=current_val.imag, parent=tk_root)
     if im is None: return
 
     z_new = re + 1j * im
@@ -292,7 +336,8 @@ def set_coordinate_polar():
     """
     Opens dialogs to set the position using Magnitude (r) and Phase (theta).
     """
-    if sm.selected is None or not _tk_root: return
+    if sm.selected is None or not _get_tk_root: return
+    tk_root = _get_tk_root()
 
     kind, idx = sm.selected
     current_val = sm.zeros[idx] if kind == "zero" else sm.poles[idx]
@@ -301,13 +346,13 @@ def set_coordinate_polar():
     current_theta = np.angle(current_val) 
 
     r = simpledialog.askfloat("Set Polar", "Magnitude (r):", 
-                              initialvalue=f"{current_r:.4f}", parent=_tk_root)
+                              initialvalue=f"{current_r:.4f}", parent=tk_root)
     if r is None: return
     if r < 0:
         r = abs(r)
 
     theta = simpledialog.askfloat("Set Polar", "Angle (radians):", 
-                                  initialvalue=f"{current_theta:.4f}", parent=_tk_root)
+                                  initialvalue=f"{current_theta:.4f}", parent=tk_root)
     if theta is None: return
 
     z_new = r * np.exp(1j * theta)
@@ -320,12 +365,7 @@ def set_coordinate_polar():
 def remove_selected():
     if sm.selected is None: return
     kind, idx = sm.selected
-    if kind == "zero": 
-        sm.zeros.pop(idx)
-        sm.zeros_opts.pop(idx)
-    else: 
-        sm.poles.pop(idx)
-        sm.poles_opts.pop(idx)
+    sm.remove_point(kind, idx)
     sm.selected = None
     trigger_update()
 
@@ -338,27 +378,25 @@ def on_response_click(event):
     if event.inaxes not in [sm.ax_mag, sm.ax_phase]:
         return
 
+    # Measure on the dense w_hires grid, not the pixel-sized plotting grid
+    mag_db, phase = dsp.response_curves(sm.w_hires, sm.w_hires_split)
+
     # Setup Colors and Data
     if event.inaxes == sm.ax_mag:
         color = 'navy'
-        H = dsp.compute_H(sm.w_hires)
-        mag_linear = np.abs(H)
-        
-        max_val = np.max(mag_linear)
-        if max_val > 1e-9:
-            mag_norm = mag_linear / max_val
-        else:
-            mag_norm = mag_linear
-            
-        y_data = 20 * np.log10(mag_norm + 1e-12)
+        y_data = mag_db
         unit_str = " dB"
     else:
         color = 'crimson'
-        y_data = np.angle(dsp.compute_H(sm.w_hires))
-
-    # Find closest point on curve (Snap)
-    idx = (np.abs(sm.w_hires - event.xdata)).argmin()
-    w_snap = sm.w_hires[idx]
+        y_data = phase
+        unit_str = " rad"
+
+    # Find closest point on curve (Snap); w_hires is sorted, so bisect
+    w = sm.w_hires
+    idx = min(int(np.searchsorted(w, event.xdata)), len(w) - 1)
+    if idx > 0 and abs(w[idx - 1] - event.xdata) < abs(w[idx] - event.xdata):
+        idx -= 1
+    w_snap = w[idx]
     y_snap = y_data[idx]
 
     # Check for "Tap to Remove" (Clicking existing annotation)
@@ -17,11 +17,16 @@
 # See <https://www.gnu.org/licenses/>.
 # =============================================================================
 
+import sys
 import matplotlib
-matplotlib.use('TkAgg') 
+# Dialogs and menus are Tk, so default to TkAgg unless the caller has
+# already set up pyplot (and with it a backend)
+if 'matplotlib.pyplot' not in sys.modules:
+    matplotlib.use('TkAgg') 
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, CheckButtons, TextBox
-import tkinter as tk
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import Bbox
 from tkinter import Menu
 import numpy as np
 
@@ -45,10 +50,6 @@ plt.rcParams.update({
     'axes.labelweight': 'bold'
 }) 
 
-# Initialize hidden Tk root for dialogs
-root = tk.Tk()
-root.withdraw()
-
 # ------------------------------------------------------------
 # 2. Figure & Axes Layout
 # ------------------------------------------------------------
@@ -94,6 +95,14 @@ ax_phase.grid(False)
 ax_imp.set_ylabel("Impulse Response", fontweight='bold', fontsize=14)
 ax_imp.grid(True, linestyle=':', alpha=0.6)
 
+# Persistent stem artists, updated in place instead of re-running ax.stem
+imp_stems = LineCollection([], colors='C0')
+ax_imp.add_collection(imp_stems)
+imp_markers, = ax_imp.plot([], [], 'C0o')
+
+# Coordinate label artists, pooled and reused by update_all (grown on demand)
+label_pools = {'zero_cart': [], 'zero_polar': [], 'pole_cart': [], 'pole_polar': []}
+
 # Transfer Function Text Object
 tf_text = fig.text(
     0.6, 0.95, "", fontsize=18, ha="center", va="center",
@@ -135,7 +144,7 @@ txt_sig.text_disp.set_clip_on(True)
 txt_sig.ax.set_xlim(0, 1)
 
 # Apply custom textbox logic
-ui.setup_advanced_textbox(txt_sig, root)
+ui.setup_advanced_textbox(txt_sig)
 
 # Store textboxes in state manager for ui_components to access
 sm.txt_n = txt_n
@@ -187,11 +196,130 @@ btn_pole.on_clicked(interact.set_mode_pole)
 # 4. Core Update Logic
 # ------------------------------------------------------------
 
+def update_response_lines():
+    """
+    Refreshes the magnitude/phase lines from the curves over w_vis.
+    Curves are memoized in dsp_engine, so UI-only redraws skip the
+    evaluation.
+    """
+    mag_db, phase = dsp.response_curves(sm.w_vis, sm.w_vis_split)
+
+    # x is fixed to w_vis (set in resize_vis_grid), so only y is replaced
+    mag_line.set_ydata(mag_db)
+    phase_line.set_ydata(phase)
+
+def resize_vis_grid():
+    """
+    Sizes w_vis to two samples per horizontal pixel of the magnitude axes
+    (capped at w_hires). Returns True if the grid changed.
+    """
+    px_width = int(ax_mag.bbox.width)
+    n = min(len(sm.w_hires), max(256, 2 * px_width))
+    if n == len(sm.w_vis) and len(mag_line.get_xdata()) == n:
+        return False
+    # Even length keeps the grid symmetric about 0 for Hermitian mirroring
+    sm.w_vis = sm.w_hires if n == len(sm.w_hires) else np.linspace(-np.pi, np.pi, n)
+    sm.w_vis_split = n // 2
+    mag_line.set_xdata(sm.w_vis)
+    phase_line.set_xdata(sm.w_vis)
+    return True
+
+def on_resize(event):
+    """Drops blit backgrounds and refits the response grid to the new size."""
+    stop_blit()
+    if resize_vis_grid():
+        update_response_lines()
+        fig.canvas.draw_idle()
+
+# Artists (and their axes) redrawn by the blitting fast path during drags
+blit_artists = (zero_plot, pole_plot, mag_line, phase_line)
+blit_axes = (ax_z, ax_mag, ax_phase)
+
+def start_blit():
+    """
+    Marks the drag-time artists as animated, renders the figure once
+    without them and caches the axes backgrounds for blitting.
+    The H(z) title is blitted too, over a full-width band twice the
+    height of its current (mathtext) extent.
+    """
+    ext = tf_text.get_window_extent(fig.canvas.get_renderer())
+    sm.blit_title_bbox = Bbox.from_extents(
+        fig.bbox.x0, ext.y0 - ext.height / 2, fig.bbox.x1, ext.y1 + ext.height / 2)
+    for artist in blit_artists:
+        artist.set_animated(True)
+    tf_text.set_animated(True)
+    fig.canvas.draw()
+    sm.blit_backgrounds = [fig.canvas.copy_from_bbox(bbox) for bbox in
+                           [ax.bbox for ax in blit_axes] + [sm.blit_title_bbox]]
+
+def stop_blit(event=None):
+    """Returns the animated artists to normal drawing and drops the backgrounds."""
+    if sm.blit_backgrounds is None: return
+    for artist in blit_artists:
+        artist.set_animated(False)
+    tf_text.set_animated(False)
+    sm.blit_backgrounds = None
+
+def update_fast():
+    """
+    Drag-time render path. Updates only the Z-plane points, the
+    magnitude/phase lines and a plain-text H(z) title, blitting them over
+    cached backgrounds. Everything else is refreshed by update_all() on
+    release.
+    """
+    if not fig.canvas.supports_blit:
+        update_all()
+        return
+    if sm.blit_backgrounds is None:
+        start_blit()
+
+    zero_plot.set_data(sm.zeros.real, sm.zeros.imag)
+    pole_plot.set_data(sm.poles.real, sm.poles.imag)
+    update_response_lines()
+    tf_text.set_text(tf_plaintext(*dsp.coeffs_quantized()))
+
+    for bg in sm.blit_backgrounds:
+        fig.canvas.restore_region(bg)
+    for artist in blit_artists:
+        artist.axes.draw_artist(artist)
+    fig.draw_artist(tf_text)
+    for ax in blit_axes:
+        fig.canvas.blit(ax.bbox)
+    fig.canvas.blit(sm.blit_title_bbox)
+
+# Last rendered mathtext H(z), keyed on (b, a, delay)
+_tf_mathtext_cache = {'key': None, 'text': ""}
+
+def tf_mathtext(b, a):
+    """Builds the mathtext H(z) title, reusing the last string if unchanged."""
+    key = (tuple(b), tuple(a), sm.system_delay)
+    if key == _tf_mathtext_cache['key']:
+        return _tf_mathtext_cache['text']
+
+    delay_str = ""
+    if sm.system_delay != 0:
+        if sm.system_delay == 1: delay_str = "z^{-1} \\cdot"
+        elif sm.system_delay == -1: delay_str = "z \\cdot "
+        else: delay_str = f"z^{{{-sm.system_delay}}} \\cdot "
+            
+    tf_str = rf"$\mathbf{{H(z)}} = {delay_str}\frac{{{fmt.poly_to_mathtext(b)}}}{{{fmt.poly_to_mathtext(a)}}}$"
+    _tf_mathtext_cache['key'] = key
+    _tf_mathtext_cache['text'] = tf_str
+    return tf_str
+
+def tf_plaintext(b, a):
+    """Builds a single-line plain-text H(z) used while dragging."""
+    delay_str = ""
+    if sm.system_delay == -1: delay_str = "z · "
+    elif sm.system_delay != 0: delay_str = f"z{fmt.superscript(-sm.system_delay)} · "
+    return f"H(z) = {delay_str}({fmt.poly_to_plaintext(b)}) / ({fmt.poly_to_plaintext(a)})"
+
 def update_all():
     """
     The main render loop. Refreshes all plots, text, and overlays 
     based on the current state in state_manager.
     """
+    stop_blit()
     
     # 1. Clear Annotation Artifacts
     for item in sm.response_annotations:
@@ -202,85 +330,94 @@ def update_all():
     sm.response_annotations = []
     
     # 2. Update Z-Plane Points
-    zero_plot.set_data([z.real for z in sm.zeros], [z.imag for z in sm.zeros])
-    pole_plot.set_data([p.real for p in sm.poles], [p.imag for p in sm.poles])
+    zero_plot.set_data(sm.zeros.real, sm.zeros.imag)
+    pole_plot.set_data(sm.poles.real, sm.poles.imag)
 
     # 3. Dynamic Z-Plane Scaling
-    all_points = sm.zeros + sm.poles
-    max_mag = max([abs(p) for p in all_points]) if all_points else 0
+    all_points = np.concatenate([sm.zeros, sm.poles])
+    max_mag = np.abs(all_points).max() if all_points.size else 0
     limit = max(1.2, max_mag * 1.2)
-    ax_z.set_xlim(-limit, limit)
-    ax_z.set_ylim(-limit, limit)
-
-    H = dsp.compute_H(sm.w_hires)
-    mag_linear = np.abs(H)
-    
-    max_val = np.max(mag_linear)
-    if max_val > 1e-9:
-        mag_norm = mag_linear / max_val
-    else:
-        mag_norm = mag_linear
-        
-    mag_db = 20 * np.log10(mag_norm + 1e-12)
+    # set_*lim invalidates the ticks even for a no-op, so only rescale on change
+    if ax_z.get_xlim() != (-limit, limit) or ax_z.get_ylim() != (-limit, limit):
+        ax_z.set_xlim(-limit, limit)
+        ax_z.set_ylim(-limit, limit)
 
-    mag_line.set_data(sm.w_hires, mag_db)
-    phase_line.set_data(sm.w_hires, np.angle(H))
+    update_response_lines()
     
-    min_db = np.min(mag_db)
     bottom_limit = -60 
     if bottom_limit > -10: 
         bottom_limit = -10
         
-    ax_mag.set_ylim(bottom=bottom_limit, top=5) 
-    ax_mag.set_xlim(-np.pi, np.pi)
-  
+    # x range is fixed at init; the y range is only reapplied when it moves
+    if ax_mag.get_ylim() != (bottom_limit, 5):
+        ax_mag.set_ylim(bottom=bottom_limit, top=5) 
+
     b, a = dsp.coeffs_quantized()
-    
-    delay_str = ""
-    if sm.system_delay != 0:
-        if sm.system_delay == 1: delay_str = "z^{-1} \\cdot"
-        elif sm.system_delay == -1: delay_str = "z \\cdot "
-        else: delay_str = f"z^{{{-sm.system_delay}}} \\cdot "
-            
-    tf_str = rf"$\mathbf{{H(z)}} = {delay_str}\frac{{{fmt.poly_to_mathtext(b)}}}{{{fmt.poly_to_mathtext(a)}}}$"
-    tf_text.set_text(tf_str)
+
+    # While dragging, show H(z) as plain text (no mathtext parsing) and defer
+    # the impulse response and overlays; on_release runs a full update
+    if sm.dragging is not None:
+        tf_text.set_text(tf_plaintext(b, a))
+        fig.canvas.draw_idle()
+        return
+
+    tf_text.set_text(tf_mathtext(b, a))
 
     # 6. Update Impulse Response
-    ax_imp.cla()
-    ax_imp.set_ylabel("Impulse Response", fontweight='bold', fontsize=14)
-    ax_imp.grid(True, linestyle=':', alpha=0.6)
-    
     n, h = dsp.stable_impulse_response()
-    ax_imp.stem(n, h, basefmt=" ", linefmt='C0-', markerfmt='C0o')
+    segs = np.zeros((len(n), 2, 2))
+    segs[:, :, 0] = n[:, None]
+    segs[:, 1, 1] = h
+    imp_stems.set_segments(segs)
+    imp_markers.set_data(n, h)
+
+    # Autoscale to the markers plus the stems' zero baseline
+    ax_imp.relim()
+    ax_imp.update_datalim([(n[0], 0), (n[-1], 0)])
+    ax_imp.autoscale_view()
 
     # 7. Draw Overlays (Coordinates)
-    # Clear old text
-    for txt in ax_z.texts:
-        txt.remove()
-        
-    def draw_overlays(points, opts, color):
-        for i, p in enumerate(points):
-            if i >= len(opts): continue
+    def place_label(pool, used, color, fc, x, y, text_str):
+        # Reuse the pool's next label artist, creating one only when it runs out
+        if used == len(pool):
+            pool.append(ax_z.text(0, 0, "", visible=False,
+                ha='center', va='bottom', fontsize=10, fontweight='bold', color=color,
+                bbox=dict(boxstyle="round,pad=0.3", fc=fc, ec=color, alpha=0.9)))
+        txt = pool[used]
+        txt.set_text(text_str)
+        txt.set_position((x, y))
+        txt.set_visible(True)
+        return used + 1
+
+    def draw_overlays(points, show, show_polar, color, cart_pool, polar_pool):
+        # Only labelled points are visited; polar coordinates are vectorized
+        r = np.abs(points); theta = np.angle(points)
+        n_cart = n_polar = 0
+        for i in np.flatnonzero(show | show_polar):
+            p = points[i]
             y_offset = 0.15
             
             # Cartesian
-            if opts[i]['show']:
+            if show[i]:
                 text_str = f"({p.real:.2f}, {p.imag:.2f})"
-                ax_z.text(p.real, p.imag + y_offset, text_str,
-                    ha='center', va='bottom', fontsize=10, fontweight='bold', color=color,
-                    bbox=dict(boxstyle="round,pad=0.3", fc="white", ec=color, alpha=0.9))
+                n_cart = place_label(cart_pool, n_cart, color, "white",
+                                     p.real, p.imag + y_offset, text_str)
                 y_offset += 0.15
 
             # Polar
-            if opts[i].get('show_polar', False):
-                r = abs(p); theta = np.angle(p)
-                text_str = f"({r:.2f}, {theta:.2f} rad)"
-                ax_z.text(p.real, p.imag + y_offset, text_str,
-                    ha='center', va='bottom', fontsize=10, fontweight='bold', color='black',
-                    bbox=dict(boxstyle="round,pad=0.3", fc="#f0f0f0", ec="black", alpha=0.9))
+            if show_polar[i]:
+                text_str = f"({r[i]:.2f}, {theta[i]:.2f} rad)"
+                n_polar = place_label(polar_pool, n_polar, 'black', "#f0f0f0",
+                                      p.real, p.imag + y_offset, text_str)
+
+        # Hide whatever the pools hold beyond this frame's labels
+        for txt in cart_pool[n_cart:] + polar_pool[n_polar:]:
+            txt.set_visible(False)
 
-    draw_overlays(sm.zeros, sm.zeros_opts, 'blue')
-    draw_overlays(sm.poles, sm.poles_opts, 'red')
+    draw_overlays(sm.zeros, sm.zeros_show, sm.zeros_show_polar, 'blue',
+                  label_pools['zero_cart'], label_pools['zero_polar'])
+    draw_overlays(sm.poles, sm.poles_show, sm.poles_show_polar, 'red',
+                  label_pools['pole_cart'], label_pools['pole_polar'])
 
     # 8. Draw Delay Visuals (Origin Points)
     for artist in sm.delay_artists: 
@@ -338,10 +475,7 @@ def reset_board(event):
     sm.mode = None
     
     # Reset State
-    sm.zeros = []
-    sm.poles = []
-    sm.zeros_opts = []
-    sm.poles_opts = []
+    sm.set_points([], [])
     sm.selected = None
     sm.system_gain = 1.0
     sm.system_delay = 0
@@ -356,8 +490,6 @@ def reset_board(event):
         sm.signal_fig = None
     
     update_all()
-    fig.canvas.draw()
-    fig.canvas.flush_events()
 
 def toggle_conjugates(label):
     sm.add_conjugates = not sm.add_conjugates
@@ -368,10 +500,11 @@ def toggle_conjugates(label):
             check_box_rect.set_facecolor('#40E0D0') # Turquoise/Blue active
         else:
             check_box_rect.set_facecolor('white')   # White inactive
-    fig.canvas.draw()
-    fig.canvas.flush_events()
+    # Only the checkbox colour changed; no filter state to re-render
+    fig.canvas.draw_idle()
 
 def show_fft_menu(event):
+    root = ui.get_tk_root()
     fft_menu = Menu(root, tearoff=0)
     options = [64, 128, 256, 512, 1024, 2048]
     
@@ -400,7 +533,7 @@ check.on_clicked(toggle_conjugates)
 btn_fft.on_clicked(show_fft_menu)
 
 # Initialize Interaction Module
-interact.init_interactions(root, update_all)
+interact.init_interactions(ui.get_tk_root, update_all, update_fast)
 
 # Connect Matplotlib Events to Interaction Module
 fig.canvas.mpl_connect("button_press_event", interact.on_press)
@@ -408,10 +541,12 @@ fig.canvas.mpl_connect("motion_notify_event", interact.on_motion)
 fig.canvas.mpl_connect("button_release_event", interact.on_release)
 fig.canvas.mpl_connect("button_press_event", interact.on_response_click)
 fig.canvas.mpl_connect('key_press_event', interact.on_key_press)
+fig.canvas.mpl_connect('resize_event', on_resize)
 
-# Special Case: Transfer Function Editor needs root and callback passed
-fig.canvas.mpl_connect('pick_event', lambda e: ui.open_tf_editor(e, root, update_all))
+# Special Case: Transfer Function Editor needs the update callback passed
+fig.canvas.mpl_connect('pick_event', lambda e: ui.open_tf_editor(e, update_all))
 
 # Initial Draw
+resize_vis_grid()
 update_all()
 plt.show()
\ No newline at end of file
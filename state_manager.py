@@ -24,8 +24,8 @@ import numpy as np
 # ------------------------------------------------------------
 
 # Mathematical State (Filter Design)
-zeros = []
-poles = []
+zeros = np.empty(0, dtype=np.complex128)
+poles = np.empty(0, dtype=np.complex128)
 system_gain = 1.0
 system_delay = 0
 
@@ -37,13 +37,66 @@ add_conjugates = False # Toggle for real-filter mode
 ghost_artist = None    # Stores the temporary visual for drag-and-drop
 
 # Plotting & Visualization Storage
-zeros_opts = []     # Display options for zeros (polar/cartesian visibility)
-poles_opts = []     # Display options for poles
+# Coordinate label visibility per point, parallel to zeros/poles
+zeros_show = np.zeros(0, dtype=bool)        # Cartesian (x,y) label for zeros
+zeros_show_polar = np.zeros(0, dtype=bool)  # Polar (r,theta) label for zeros
+poles_show = np.zeros(0, dtype=bool)
+poles_show_polar = np.zeros(0, dtype=bool)
 vector_artists = [] # Lines connecting poles/zeros (if implemented)
 response_annotations = [] # Markers on magnitude/phase plots
 delay_artists = []  # Visual indicators for system delay (origin poles/zeros)
 signal_fig = None   # Reference to the independent signal analysis window
+signal_lines = None # Persistent input/output lines of the signal analysis window
+blit_backgrounds = None # Cached axes backgrounds while blitting a drag
+blit_title_bbox = None  # Figure band behind the H(z) title, blitted while dragging
 
 # Frequency Vectors
-w_hires = np.linspace(-np.pi, np.pi, 2048) # High-res axis for smooth plotting
-N_impulse = 64      # Number of points for FFT/Impulse calculation
\ No newline at end of file
+w_hires = np.linspace(-np.pi, np.pi, 2048) # High-res axis for click-to-measure
+w_hires_split = len(w_hires) // 2 # First w >= 0 (the grid is symmetric about 0)
+w_vis = w_hires     # Plotting axis, resized to ~2 samples per pixel of ax_mag
+w_vis_split = w_hires_split # First w >= 0 on w_vis
+N_impulse = 64      # Number of points for FFT/Impulse calculation
+
+# ------------------------------------------------------------
+# Pole/Zero Storage Helpers
+# ------------------------------------------------------------
+# zeros/poles and their label masks are parallel arrays; these helpers
+# keep them the same length.
+
+def add_points(kind, new_points):
+    """Appends points (labels hidden) to the zeros or poles ('zero'/'pole')."""
+    global zeros, zeros_show, zeros_show_polar
+    global poles, poles_show, poles_show_polar
+    hidden = np.zeros(len(new_points), dtype=bool)
+    if kind == "zero":
+        zeros = np.append(zeros, new_points)
+        zeros_show = np.append(zeros_show, hidden)
+        zeros_show_polar = np.append(zeros_show_polar, hidden)
+    else:
+        poles = np.append(poles, new_points)
+        poles_show = np.append(poles_show, hidden)
+        poles_show_polar = np.append(poles_show_polar, hidden)
+
+def remove_point(kind, idx):
+    """Deletes the zero or pole at index idx along with its label flags."""
+    global zeros, zeros_show, zeros_show_polar
+    global poles, poles_show, poles_show_polar
+    if kind == "zero":
+        zeros = np.delete(zeros, idx)
+        zeros_show = np.delete(zeros_show, idx)
+        zeros_show_polar = np.delete(zeros_show_polar, idx)
+    else:
+        poles = np.delete(poles, idx)
+        poles_show = np.delete(poles_show, idx)
+        poles_show_polar = np.delete(poles_show_polar, idx)
+
+def set_points(new_zeros, new_poles):
+    """Replaces all zeros and poles, hiding every coordinate label."""
+    global zeros, zeros_show, zeros_show_polar
+    global poles, poles_show, poles_show_polar
+    zeros = np.asarray(new_zeros, dtype=np.complex128)
+    poles = np.asarray(new_poles, dtype=np.complex128)
+    zeros_show = np.zeros(len(zeros), dtype=bool)
+    zeros_show_polar = np.zeros(len(zeros), dtype=bool)
+    poles_show = np.zeros(len(poles), dtype=bool)
+    poles_show_polar = np.zeros(len(poles), dtype=bool)
@@ -17,28 +17,66 @@
 # See <https://www.gnu.org/licenses/>.
 # =============================================================================
 
+import ast
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import PathCollection
+from matplotlib.markers import MarkerStyle
+from matplotlib.transforms import IdentityTransform
+from matplotlib.ticker import MaxNLocator
+from matplotlib.backend_bases import TimerBase
 
 # Internal Modules
 import state_manager as sm
 import dsp_engine as dsp
 import formatting_utils as fmt
 
+# ------------------------------------------------------------
+# Tk Root
+# ------------------------------------------------------------
+
+_tk_root = None
+
+def get_tk_root():
+    """
+    Returns the hidden Tk root used for dialogs and the clipboard,
+    creating it on first use rather than at import.
+    """
+    global _tk_root
+    if _tk_root is None:
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+    return _tk_root
+
 # ------------------------------------------------------------
 # Custom Widget Logic
 # ------------------------------------------------------------
 
-def setup_advanced_textbox(textbox, tk_root):
+class _TBState:
+    """Per-textbox state for setup_advanced_textbox's handlers."""
+    __slots__ = ('select_all', 'cached_box_width', 'last_x', 'pending_update')
+
+    def __init__(self):
+        self.select_all = False        # Ctrl+A active; next key replaces text
+        self.cached_box_width = None   # Axis width in px, dropped on resize
+        self.last_x = None             # Last text x applied by update_view
+        self.pending_update = False    # An update_view is already scheduled
+
+def setup_advanced_textbox(textbox):
     """
     Enhances a Matplotlib TextBox with clipboard support (Ctrl+C/V),
     Select All (Ctrl+A), and smart scrolling that tracks the cursor.
+    The Tk root for the clipboard is only created on the first copy/paste.
     """
-    textbox._select_all_mode = False
+    tb = textbox._tb = _TBState()
+
+    # Default Alignment (Left, with small padding); it never changes
+    base_x = 0.05
+    textbox.text_disp.set_horizontalalignment('left')
 
-    def update_view(event=None):
+    def update_view(*_):
         """
         Smart scrolling: Shifts the text horizontally so the area 
         around the cursor is always visible.
@@ -51,17 +89,15 @@ def setup_advanced_textbox(textbox, tk_root):
         bbox = txt_obj.get_window_extent(renderer)
         text_width = bbox.width
         
-        # Get the width of the textbox container (axis)
-        box_bbox = textbox.ax.get_window_extent(renderer)
-        box_width = box_bbox.width
+        # Width of the textbox container (axis), constant until a resize
+        box_width = tb.cached_box_width
+        if box_width is None:
+            box_width = textbox.ax.get_window_extent(renderer).width
+            tb.cached_box_width = box_width
 
         # 2. Calculate Overflow
         overflow = text_width - box_width
         
-        # Default Alignment (Left, with small padding)
-        base_x = 0.05
-        align = 'left'
-        
         # 3. Apply Scroll if needed
         if overflow > 0 and len(textbox.text) > 0:
             cursor_ratio = textbox.cursor_index / len(textbox.text)
@@ -70,40 +106,79 @@ def setup_advanced_textbox(textbox, tk_root):
             # We add a small buffer so the cursor isn't glued to the edge.
             shift_pixels = -1 * cursor_ratio * (overflow + 20) # +20px buffer
             new_x = base_x + (shift_pixels / box_width)
-            
-            # Apply
-            txt_obj.set_horizontalalignment(align)
-            txt_obj.set_x(new_x)
-            
         else:
             # Text fits? Reset to standard Left alignment
-            txt_obj.set_horizontalalignment(align)
-            txt_obj.set_x(base_x)
+            new_x = base_x
 
+        # Only redraw when the scroll position actually moved
+        if new_x == tb.last_x:
+            return
+        txt_obj.set_x(new_x)
+        tb.last_x = new_x
         textbox.ax.figure.canvas.draw_idle()
 
+    def on_resize(event):
+        tb.cached_box_width = None
+
+    def flush_update_view():
+        tb.pending_update = False
+        update_view()
+
+    # Single-shot backend timer for the debounce; a bare TimerBase (Agg and
+    # other non-interactive canvases) never fires, so update directly there
+    view_timer = textbox.ax.figure.canvas.new_timer(interval=16)
+    view_timer.single_shot = True
+    view_timer.add_callback(flush_update_view)
+    has_event_loop = type(view_timer) is not TimerBase
+
+    def schedule_update_view(*_):
+        """
+        Coalesces update_view calls from a burst of keys / text changes
+        into one per ~16 ms (60 Hz) idle tick.
+        """
+        if not has_event_loop:
+            update_view()
+            return
+        if tb.pending_update:
+            return
+        tb.pending_update = True
+        view_timer.start()
+
+    def replace_text(new_text, cursor=None):
+        """
+        Leaves select-all mode and swaps in new_text with a single set_val,
+        so the colour reset and cursor move render in set_val's own redraw.
+        """
+        tb.select_all = False
+        textbox.text_disp.set_color('black')
+        textbox.cursor_index = len(new_text) if cursor is None else cursor
+        if textbox.text == new_text:
+            # set_val would return without redrawing
+            textbox.ax.figure.canvas.draw_idle()
+        else:
+            textbox.set_val(new_text)
+
     def on_key_press(event):
         if event.inaxes != textbox.ax:
             return
 
         # --- 1. Handle Ctrl+A (Select All) ---
         if event.key == 'ctrl+a':
-            textbox._select_all_mode = True
+            tb.select_all = True
             textbox.text_disp.set_color('blue')
             textbox.ax.figure.canvas.draw_idle()
             return
 
         # --- 2. Handle Backspace ---
         if event.key == 'backspace':
-            if textbox._select_all_mode:
-                textbox.set_val("")
-                textbox._select_all_mode = False
-                textbox.text_disp.set_color('black')
+            if tb.select_all:
+                replace_text("")
             else:
                 pass 
 
         # --- 3. Handle Copy (Ctrl+C) ---
         elif event.key == 'ctrl+c':
+            tk_root = get_tk_root()
             tk_root.clipboard_clear()
             tk_root.clipboard_append(textbox.text)
             tk_root.update()
@@ -111,34 +186,41 @@ def setup_advanced_textbox(textbox, tk_root):
         # --- 4. Handle Paste (Ctrl+V) ---
         elif event.key == 'ctrl+v':
             try:
-                paste_text = tk_root.clipboard_get()
+                paste_text = get_tk_root().clipboard_get()
                 current_text = textbox.text
-                if textbox._select_all_mode:
-                    new_text = paste_text
+                if tb.select_all:
+                    replace_text(paste_text)
                 else:
                     c_idx = textbox.cursor_index
                     new_text = current_text[:c_idx] + paste_text + current_text[c_idx:]
-                
-                textbox.set_val(new_text)
-                textbox._select_all_mode = False
-                textbox.text_disp.set_color('black')
+                    replace_text(new_text, c_idx + len(paste_text))
             except Exception:
                 pass
 
         # --- 5. Handle Normal Typing ---
         elif len(event.key) == 1 and not event.key.startswith('ctrl'):
-            if textbox._select_all_mode:
-                textbox.set_val(event.key)
-                textbox._select_all_mode = False
-                textbox.text_disp.set_color('black')
+            if tb.select_all:
+                replace_text(event.key)
 
-        update_view()
+        schedule_update_view()
 
     # Connect the event
     textbox.ax.figure.canvas.mpl_connect('key_press_event', on_key_press)
+    textbox.ax.figure.canvas.mpl_connect('resize_event', on_resize)
     
     # Also update view on any text content change
-    textbox.on_text_change(lambda x: update_view())
+    textbox.on_text_change(schedule_update_view)
+
+def _marker_path(marker):
+    """Unit-size path of a marker, as scatter builds it."""
+    style = MarkerStyle(marker)
+    return style.get_path().transformed(style.get_transform())
+
+# Toolbar icon paths, built once: (path, x, edge colour, edge width)
+_BUTTON_ICONS = {
+    'zero': (_marker_path('o'), 0.5, 'blue', 2),   # Blue Circle
+    'pole': (_marker_path('x'), 0.12, 'red', 3),   # Red X
+}
 
 def decorate_button(ax, type_):
     """
@@ -147,64 +229,189 @@ def decorate_button(ax, type_):
     ax.axis('off')
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
-    if type_ == 'zero':
-        # Blue Circle
-        ax.plot(0.5, 0.55, 'o', color='blue', markeredgewidth=2, 
-                markersize=18, markerfacecolor='none', label='Zero')
-        ax.text(0.5, 0.25, "Add Zero", ha='center', va='top', fontsize=9, fontweight='bold')
-    elif type_ == 'pole':
-        # Red X
-        ax.plot(0.12, 0.55, 'x', color='red', markeredgewidth=3, 
-                markersize=18, label='Pole')
-        ax.text(0.12, 0.25, "Add Pole", ha='center', va='top', fontsize=9, fontweight='bold')
+    if type_ not in _BUTTON_ICONS:
+        return
+
+    # A single PathCollection (the artist scatter uses) for the icon
+    path, x, color, lw = _BUTTON_ICONS[type_]
+    icon = PathCollection(
+        [path], sizes=[18 ** 2], facecolors='none', edgecolors=[color],
+        linewidths=[lw], offsets=[(x, 0.55)], transform=IdentityTransform())
+    # Set after construction: the offset_transform keyword is matplotlib >= 3.6
+    icon.set_offset_transform(ax.transData)
+    ax.add_collection(icon)
+    label = "Add Zero" if type_ == 'zero' else "Add Pole"
+    ax.text(x, 0.25, label, ha='center', va='top', fontsize=9, fontweight='bold')
 
 # ------------------------------------------------------------
 # Popups and Dialogs
 # ------------------------------------------------------------
 
+# Names available to signal expressions; n and the pulse-train helpers
+# depend on the sample count and are added per call
+_STATIC_MATH_ENV = {
+    'np': np,
+    'random': np.random,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'exp': np.exp, 'pi': np.pi, 'sqrt': np.sqrt,
+    'log': np.log10, 'ln': np.log, 'abs': np.abs,
+    'sum': np.sum, 'real': np.real, 'imag': np.imag, 'sign': np.sign,
+    'u': dsp.unit_step,      
+    'step': dsp.unit_step,   
+    'd': dsp.impulse,        
+    'delta': dsp.impulse,    
+    'impulse': dsp.impulse,  
+    'r': dsp.ramp,           
+    'sinc': np.sinc,
+    'rect': dsp.rect,        
+    'len': len,
+}
+
+# Sample index arrays n = 0..num_pts-1, keyed on num_pts (read-only)
+_n_cache = {}
+_N_CACHE_SIZE = 4
+
+# Names a signal expression may reference, and the AST nodes it may contain
+_EXPR_NAMES = frozenset(_STATIC_MATH_ENV) | {'n', 'pulse_train', 'pt'}
+
+# The only attribute accesses allowed: pure numpy math / array builders and
+# random generators (no I/O, no pickling, no attributes on n or on results)
+_NP_FUNCS = (
+    'sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2',
+    'sinh', 'cosh', 'tanh', 'exp', 'exp2', 'expm1', 'log', 'log10', 'log2',
+    'log1p', 'sqrt', 'cbrt', 'square', 'power', 'hypot', 'abs', 'absolute',
+    'sign', 'sinc', 'real', 'imag', 'conj', 'angle', 'floor', 'ceil',
+    'round', 'rint', 'trunc', 'mod', 'fmod', 'maximum', 'minimum', 'clip',
+    'where', 'heaviside', 'cumsum', 'cumprod', 'diff', 'sum', 'prod',
+    'mean', 'max', 'min', 'zeros', 'ones', 'zeros_like', 'ones_like',
+    'full', 'full_like', 'arange', 'linspace', 'convolve', 'roll', 'flip',
+    'concatenate', 'pad', 'array', 'asarray', 'tile', 'repeat', 'append',
+    'stack', 'hstack', 'piecewise', 'select', 'logical_and', 'logical_or',
+    'logical_not', 'isfinite', 'pi', 'e', 'inf', 'nan',
+)
+_FFT_FUNCS = ('fft', 'ifft', 'rfft', 'irfft', 'fftshift', 'ifftshift',
+              'fftfreq')
+_RANDOM_FUNCS = ('rand', 'randn', 'normal', 'uniform', 'randint', 'random',
+                 'standard_normal', 'choice')
+_EXPR_ATTRS = frozenset(
+    [f'np.{f}' for f in _NP_FUNCS]
+    + [f'np.fft.{f}' for f in _FFT_FUNCS]
+    + [f'{mod}.{g}' for mod in ('np.random', 'random') for g in _RANDOM_FUNCS])
+
+def _attr_path(node):
+    """Dotted name of an attribute chain on a plain name (else None)."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+_EXPR_NODES = (
+    ast.Expression, ast.Load, ast.Constant, ast.Name, ast.Attribute,
+    ast.Call, ast.keyword, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare,
+    ast.IfExp, ast.Subscript, ast.Slice, ast.Tuple, ast.List,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+)
+
+# Compiled signal expressions, keyed on the expression text
+_expr_cache = {}
+_EXPR_CACHE_SIZE = 32
+
+def _parse_expr(expr):
+    """
+    Parses a signal expression and checks it against the whitelist:
+    only known names, attribute access only as one of _EXPR_ATTRS
+    (np.sin, np.random.randn, ...), and only plain arithmetic / call /
+    indexing syntax. The modules np and random can't be used bare.
+    """
+    tree = ast.parse(expr.strip(), mode='eval')
+
+    # Nodes forming an allowed np.<func> / random.<gen> chain
+    allowed = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and _attr_path(node) in _EXPR_ATTRS:
+            while isinstance(node, ast.Attribute):
+                allowed.add(id(node))
+                node = node.value
+            allowed.add(id(node))
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _EXPR_NODES):
+            raise ValueError(f"'{type(node).__name__}' is not allowed")
+        if isinstance(node, ast.Name) and node.id not in _EXPR_NAMES:
+            raise ValueError(f"unknown name '{node.id}'")
+        if isinstance(node, (ast.Name, ast.Attribute)) and id(node) not in allowed:
+            if isinstance(node, ast.Attribute):
+                name = _attr_path(node) or f"<expression>.{node.attr}"
+                raise ValueError(f"attribute '{name}' is not allowed")
+            if node.id in ('np', 'random'):
+                raise ValueError(f"'{node.id}' can only be used as {node.id}.<function>")
+    return tree
+
+def _compile_expr(expr):
+    """Compiles a signal expression once; reruns reuse the code object."""
+    code = _expr_cache.get(expr)
+    if code is None:
+        code = compile(_parse_expr(expr), '<signal>', 'eval')
+        dsp.cache_put(_expr_cache, expr, code, _EXPR_CACHE_SIZE)
+    return code
+
+def _set_signal_limits(ax, num_pts, *signals):
+    """
+    Sets fixed axis limits from the plotted samples (5% y margin, as
+    autoscaling would give) instead of relim/autoscale_view.
+    """
+    ax.set_xlim(0, max(num_pts - 1, 1), auto=False)
+    vals = np.concatenate([np.real(s) for s in signals])
+    vals = vals[np.isfinite(vals)]
+    if vals.size == 0:
+        return
+    lo, hi = float(vals.min()), float(vals.max())
+    pad = 0.05 * (hi - lo) if hi > lo else 0.5
+    ax.set_ylim(lo - pad, hi + pad, auto=False)
+
+# Signal textboxes, looked up on sm once main.py has registered them
+_txt_refs = {}
+
 def show_signal_analysis(event=None):
     """
     Opens a separate Matplotlib figure to simulate filtering a custom signal.
     """
-    txt_n = getattr(sm, 'txt_n', None)
-    txt_sig = getattr(sm, 'txt_sig', None)
-
-    if not txt_n or not txt_sig:
-        return
+    if not _txt_refs:
+        txt_n = getattr(sm, 'txt_n', None)
+        txt_sig = getattr(sm, 'txt_sig', None)
+        if not txt_n or not txt_sig:
+            return
+        _txt_refs['n'] = txt_n
+        _txt_refs['sig'] = txt_sig
+    txt_n = _txt_refs['n']
+    txt_sig = _txt_refs['sig']
 
     try:
         num_pts = int(txt_n.text)
     except:
         num_pts = 200
-    n_array = np.arange(num_pts)
+    n_array = _n_cache.get(num_pts)
+    if n_array is None:
+        n_array = np.arange(num_pts)
+        n_array.flags.writeable = False
+        dsp.cache_put(_n_cache, num_pts, n_array, _N_CACHE_SIZE)
 
     try:
         expr = txt_sig.text
         
-        math_env = {
-            'n': n_array,
-            'np': np,
-            'random': np.random,
-            'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
-            'exp': np.exp, 'pi': np.pi, 'sqrt': np.sqrt,
-            'log': np.log10, 'ln': np.log, 'abs': np.abs,
-            'sum': np.sum, 'real': np.real, 'imag': np.imag, 'sign': np.sign,
-            'u': dsp.unit_step,      
-            'step': dsp.unit_step,   
-            'd': dsp.impulse,        
-            'delta': dsp.impulse,    
-            'impulse': dsp.impulse,  
-            'r': dsp.ramp,           
-            'sinc': np.sinc,
-            'rect': dsp.rect,        
-            'len': len,
-            'pulse_train': lambda start, space, num: dsp.pulse_train_gen(n_array, start, space, num),
-            'pt': lambda start, space, num: dsp.pulse_train_gen(n_array, start, space, num)
-        }
-
-        x = eval(expr, {"__builtins__": None}, math_env)
+        math_env = _STATIC_MATH_ENV.copy()
+        math_env['n'] = n_array
+        math_env['pulse_train'] = math_env['pt'] = \
+            lambda start, space, num: dsp.pulse_train_gen(n_array, start, space, num)
+
+        x = eval(_compile_expr(expr), {"__builtins__": None}, math_env)
         x = np.array(x, dtype=float)
-        if x.ndim == 0: x = np.full(num_pts, x)
+        # Constant signal: a read-only broadcast view instead of a filled copy
+        if x.ndim == 0: x = np.broadcast_to(x, (num_pts,))
         
     except Exception as e:
         tk.messagebox.showerror("Signal Error", f"Invalid Expression: {e}")
@@ -215,38 +422,51 @@ def show_signal_analysis(event=None):
     
     b, a = dsp.coeffs_quantized()
     
-    y = dsp.filter_signal(b, a, x)
-
-    if sm.system_delay != 0:
-        y = np.roll(y, sm.system_delay)
-        if sm.system_delay > 0: y[:sm.system_delay] = 0
-        else: y[sm.system_delay:] = 0
+    y = dsp.filter_signal(b, a, x, sm.system_delay)
 
-    if sm.signal_fig is None or not plt.fignum_exists(sm.signal_fig.number):
+    # Build the window and its lines once; later runs only swap the data
+    new_window = sm.signal_fig is None or not plt.fignum_exists(sm.signal_fig.number)
+    if new_window:
         sm.signal_fig = plt.figure("Signal Analysis", figsize=(9, 6))
-    else:
-        sm.signal_fig.clf()
-    
-    ax1 = sm.signal_fig.add_subplot(211)
+        # Layout is solved when the window opens and again only on resize
+        sm.signal_fig.canvas.mpl_connect(
+            'resize_event', lambda e: e.canvas.figure.tight_layout())
+
+        ax1 = sm.signal_fig.add_subplot(211)
+        input_line, = ax1.plot([], [], 'red', label='Input')
+        ax1.grid(True, alpha=0.3); ax1.legend()
+        ax1.xaxis.set_major_locator(MaxNLocator(6))
+
+        ax2 = sm.signal_fig.add_subplot(212)
+        ax2.set_title("Filtered Output y[n]")
+        output_line, = ax2.plot([], [], 'b', linewidth=2, label='Output')
+        input_ref_line, = ax2.plot([], [], 'red', alpha=0.4, linestyle='--') 
+        ax2.grid(True, alpha=0.3); ax2.legend()
+        ax2.xaxis.set_major_locator(MaxNLocator(6))
+
+        sm.signal_lines = {'input': input_line, 'output': output_line,
+                           'input_ref': input_ref_line}
+
+    lines = sm.signal_lines
+    ax1 = lines['input'].axes
+    ax2 = lines['output'].axes
     
     # FIX: Use a raw string format if possible, but the main fix is in formatting_utils.py
     # We remove the "Input Signal x[n]:" text from the math block to avoid parser confusion.
     ax1.set_title(f"Input Signal: {latex_title}", fontsize=12)
+
+    lines['input'].set_data(n_array, x)
+    lines['output'].set_data(n_array, y)
+    lines['input_ref'].set_data(n_array, x)
+    _set_signal_limits(ax1, num_pts, x)
+    _set_signal_limits(ax2, num_pts, x, y)
     
-    ax1.plot(n_array, x, 'red', label='Input')
-    ax1.grid(True, alpha=0.3); ax1.legend()
-
-    ax2 = sm.signal_fig.add_subplot(212)
-    ax2.set_title("Filtered Output y[n]")
-    ax2.plot(n_array, y, 'b', linewidth=2, label='Output')
-    ax2.plot(n_array, x, 'red', alpha=0.4, linestyle='--') 
-    ax2.grid(True, alpha=0.3); ax2.legend()
-    
-    sm.signal_fig.tight_layout()
+    if new_window:
+        sm.signal_fig.tight_layout()
     sm.signal_fig.canvas.draw_idle()
     sm.signal_fig.show()
 
-def open_tf_editor(event, tk_root, update_callback):
+def open_tf_editor(event, update_callback):
     """
     Opens a Tkinter dialog to manually edit the Transfer Function coefficients.
     """
@@ -255,7 +475,7 @@ def open_tf_editor(event, tk_root, update_callback):
     if event.artist != tf_text_artist: 
         return
 
-    dialog = tk.Toplevel(tk_root)
+    dialog = tk.Toplevel(get_tk_root())
     dialog.title("Edit Transfer Function")
     dialog.geometry("400x250") 
     
@@ -273,7 +493,16 @@ def open_tf_editor(event, tk_root, update_callback):
     # Get current coeffs for defaults
     curr_b, curr_a = dsp.coeffs_quantized()
     
-    def arr_to_str(arr): return ", ".join([str(x) for x in arr])
+    def arr_to_str(arr):
+        """
+        Shortest round-tripping text per coefficient: '0.5' for real values,
+        '0.64+0.1j' (no parentheses) for complex ones.
+        """
+        parts = []
+        append = parts.append
+        for c in np.asarray(arr, dtype=complex).tolist():
+            append(repr(c.real) if c.imag == 0 else f"{c.real!r}{c.imag:+}j")
+        return ", ".join(parts)
     
     entry_b = add_row("Numerator (b):", arr_to_str(curr_b))
     entry_a = add_row("Denominator (a):", arr_to_str(curr_a))
@@ -310,16 +539,11 @@ def open_tf_editor(event, tk_root, update_callback):
             gain_den = new_poles_raw[0] if len(new_poles_raw) > 0 and new_poles_raw[0] != 0 else 1.0
             new_gain = abs(gain_num / gain_den)
             
-            # Apply to State Manager
-            sm.zeros = [complex(z) for z in new_zeros]
-            sm.poles = [complex(p) for p in new_poles]
+            # Apply to State Manager (also resets display options)
+            sm.set_points(new_zeros, new_poles)
             sm.system_gain = new_gain
             sm.system_delay = delay
             
-            # Reset display options
-            sm.zeros_opts = [{'show': False, 'show_polar': False} for _ in sm.zeros]
-            sm.poles_opts = [{'show': False, 'show_polar': False} for _ in sm.poles]
-            
             # Refresh Plots
             update_callback()
             dialog.destroy()